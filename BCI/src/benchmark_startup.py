@@ -0,0 +1,168 @@
+## \file benchmark_startup.py
+#  \brief Start-up benchmark: per-process import cost and time-to-first-score.
+#
+#  Each process role is imported in a fresh interpreter to measure its import cost and to
+#  report which heavy packages it pulls in. Time-to-first-score follows main()'s start-up order
+#  with the spawn start method: the processor is started first, then an acquisition process
+#  imports MNE, reads the EDF, selects the pair and streams one epoch. The number therefore
+#  includes the EDF load and its overlap with the processor's imports; it excludes the GUI.
+#
+#  Usage:
+#  \code
+#  python benchmark_startup.py [--edf ../data/1.edf] [--realtime] [--runs 3]
+#  \endcode
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+## \brief Directory holding the pipeline modules.
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+## \brief Packages whose presence in a process is reported.
+HEAVY_MODULES = ['PyQt5', 'matplotlib', 'mne', 'scipy', 'numpy', 'panda3d']
+
+## \brief Import statement executed by each process role at start-up.
+PROCESS_IMPORTS = {
+    'main (spawn bootstrap)': 'import main',
+    'processor': 'import main; import scan_processing',
+    'acquisition': 'import data_acquisition, mne, matplotlib.pyplot, matplotlib.animation',
+    'gui': 'import PyQt5.QtWidgets, eeg_interface',
+}
+
+## \brief Code run in a fresh interpreter to time one import statement.
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    exec({statement!r})
+    error = None
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded, "error": error}}))
+"""
+
+## \brief Times an import statement in a fresh interpreter.
+#  \param statement Python import statement to execute.
+#  \return Dict with import seconds, interpreter wall seconds, heavy modules loaded, and any error.
+def measure_import_cost(statement):
+    code = IMPORT_PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["wall"] = wall
+    return report
+
+## \brief Runs main.run_processor with its console output silenced (child process target).
+#  \param processor_kwargs Keyword arguments for the ScanProcessing constructor.
+def run_quiet_processor(processor_kwargs):
+    sys.stdout = open(os.devnull, "w")
+    from main import run_processor
+    run_processor(processor_kwargs)
+
+## \brief Loads one epoch-plus of EEG for the benchmark.
+#  \param edf_path Optional EDF file; synthetic alpha-band data is used when None.
+#  \param num_samples Number of samples to return.
+#  \param dtype Sample dtype.
+#  \return 2D array (2 channels x num_samples).
+def load_samples(edf_path, num_samples, dtype):
+    import numpy as np
+
+    if edf_path is None:
+        t = np.arange(num_samples) / 256
+        rng = np.random.default_rng(0)
+        data = rng.normal(0, 1e-5, (2, num_samples)) + 2e-5 * np.sin(2 * np.pi * 11 * t) * np.array([[1.0], [1.2]])
+        return data.astype(dtype)
+
+    from data_acquisition import DataAquisition
+
+    acquisition = DataAquisition(edf_path, None, dtype=dtype)
+    acquisition.read_edf()
+    acquisition.select_channels(['EEG F3-LE', 'EEG F4-LE'])
+    return acquisition.selected_data[:, :num_samples]
+
+## \brief Loads the EEG and streams it to the processor (acquisition child process target).
+#  \param data_queue Queue read by the processor.
+#  \param edf_path Optional EDF file; synthetic data is used when None.
+#  \param num_samples Number of samples to stream.
+#  \param realtime Stream at 256 Hz instead of as fast as possible.
+#  \param dtype Sample dtype.
+def run_quiet_acquisition(data_queue, edf_path, num_samples, realtime, dtype):
+    sys.stdout = open(os.devnull, "w")
+    samples = load_samples(edf_path, num_samples, dtype)
+    for i in range(samples.shape[1]):
+        data_queue.put(samples[:, i].reshape(-1, 1))
+        if realtime:
+            time.sleep(1 / 256)
+
+## \brief Measures time from launching the pipeline to its first score, in main()'s start-up order.
+#
+#  The processor is started first and the acquisition process (EDF load, channel selection,
+#  streaming) second, so the processor's imports overlap the load as they do in main().
+#
+#  \param edf_path Optional EDF file; synthetic data is used when None.
+#  \param num_samples Number of samples to stream.
+#  \param realtime Stream at 256 Hz instead of as fast as possible.
+#  \param dtype Pipeline dtype.
+#  \return Seconds from process start to the first score message.
+def time_to_first_score(edf_path, num_samples, realtime=False, dtype='float32'):
+    ctx = multiprocessing.get_context("spawn")
+    data_queue = ctx.Queue()
+    gui_queue = ctx.Queue()
+    processor_kwargs = dict(
+        queue=data_queue,
+        gui_queue=gui_queue,
+        low_cut=8,
+        high_cut=12,
+        asymmetry_channels=[0, 1],
+        selected_channel_names=['EEG F3-LE', 'EEG F4-LE'],
+        dtype=dtype
+    )
+
+    start = time.perf_counter()
+    processor = ctx.Process(target=run_quiet_processor, args=(processor_kwargs,))
+    processor.start()
+    acquisition = ctx.Process(target=run_quiet_acquisition, args=(data_queue, edf_path, num_samples, realtime, dtype))
+    acquisition.start()
+    try:
+        while True:
+            message = gui_queue.get(timeout=60)
+            if isinstance(message, dict) and "score" in message:
+                return time.perf_counter() - start
+    finally:
+        for process in (acquisition, processor):
+            process.terminate()
+            process.join()
+
+## \brief Runs the benchmark and prints a report.
+def main():
+    parser = argparse.ArgumentParser(description="Start-up benchmark for the BCI pipeline.")
+    parser.add_argument("--edf", help="EDF file to stream (default: synthetic data)")
+    parser.add_argument("--realtime", action="store_true", help="Stream samples at 256 Hz")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per measurement")
+    parser.add_argument("--dtype", default="float32", help="Pipeline dtype")
+    args = parser.parse_args()
+
+    print("Per-process import cost (fresh interpreter, best of runs):")
+    for role, statement in PROCESS_IMPORTS.items():
+        reports = [measure_import_cost(statement) for _ in range(args.runs)]
+        best = min(reports, key=lambda r: r["wall"])
+        if best["error"]:
+            print(f"  {role:<24} unavailable ({best['error']})")
+            continue
+        print(f"  {role:<24} import {best['seconds'] * 1000:7.1f} ms   interpreter {best['wall'] * 1000:7.1f} ms   loads: {', '.join(best['loaded']) or '-'}")
+
+    times = [time_to_first_score(args.edf, 257, args.realtime, args.dtype) for _ in range(args.runs)]
+    mode = "real-time" if args.realtime else "as fast as possible"
+    source = "EDF load included" if args.edf else "synthetic data, no EDF load"
+    print(f"Time to first score (spawn, {mode}, {source}): best {min(times) * 1000:.1f} ms, mean {sum(times) / len(times) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
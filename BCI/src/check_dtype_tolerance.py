@@ -0,0 +1,76 @@
+## \file check_dtype_tolerance.py
+#  \brief Checks that the float32 data path scores within DTYPE_SCORE_TOLERANCE of float64.
+#
+#  Sweeps every low/high cut pair the GUI offers (1–49 Hz low, up to 50 Hz high) on synthetic
+#  EEG with and without a 1 mV DC offset, scores ten seconds of data with both dtypes, and
+#  exits non-zero if any mapped score differs by more than the documented tolerance.
+#
+#  Usage:
+#  \code
+#  python check_dtype_tolerance.py [--seeds 2]
+#  \endcode
+
+import argparse
+import contextlib
+import io
+import sys
+import numpy as np
+from scan_processing import ScanProcessing, DTYPE_SCORE_TOLERANCE
+
+## \class ScoreCollector
+#  \brief Stand-in for the GUI queue that keeps the last score put on it.
+class ScoreCollector:
+    def __init__(self):
+        self.score = None
+
+    def put(self, message):
+        self.score = message["score"]
+
+## \brief Generates two channels of synthetic EEG (V) with a band-limited asymmetric component.
+#  \param seed Random seed.
+#  \param dc_offset DC offset added to both channels (V).
+#  \param num_samples Number of samples at 256 Hz.
+#  \return 2D float64 array (2 channels x num_samples).
+def synthetic_eeg(seed, dc_offset, num_samples=2560):
+    rng = np.random.default_rng(seed)
+    t = np.arange(num_samples) / 256
+    data = rng.normal(0, 1e-5, (2, num_samples))
+    for freq in rng.uniform(1, 50, 6):
+        data += rng.uniform(5e-6, 2e-5) * np.sin(2 * np.pi * freq * t) * np.array([[1.0], [rng.uniform(0.8, 1.2)]])
+    return data + dc_offset
+
+## \brief Scores one window with the given band and dtype, as ScanProcessing does in the live loop.
+#  \return Mapped score (0–100).
+def score(data, low_cut, high_cut, dtype):
+    collector = ScoreCollector()
+    processor = ScanProcessing(None, collector, low_cut=low_cut, high_cut=high_cut, asymmetry_channels=[0, 1], dtype=dtype)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.process_window(data.astype(dtype))
+    return collector.score
+
+## \brief Runs the sweep and reports the worst case.
+def main():
+    parser = argparse.ArgumentParser(description="float32 vs float64 score tolerance check.")
+    parser.add_argument("--seeds", type=int, default=2, help="Synthetic recordings per DC offset")
+    args = parser.parse_args()
+
+    worst = (0.0, (0.0, 0, 1, 2))
+    for dc_offset in (0.0, 1e-3):
+        for seed in range(args.seeds):
+            data = synthetic_eeg(seed, dc_offset)
+            for low_cut in range(1, 50):
+                for high_cut in range(low_cut + 1, 51):
+                    diff = abs(score(data, low_cut, high_cut, 'float32') - score(data, low_cut, high_cut, 'float64'))
+                    if diff > worst[0]:
+                        worst = (diff, (dc_offset, seed, low_cut, high_cut))
+
+    diff, case = worst
+    print(f"Worst |float32 - float64| mapped score difference: {diff:.2e} (dc={case[0]} V, seed={case[1]}, band={case[2]}-{case[3]} Hz)")
+    print(f"Documented tolerance: {DTYPE_SCORE_TOLERANCE:.0e}")
+    if diff > DTYPE_SCORE_TOLERANCE:
+        print("❌ float32 path exceeds the documented tolerance")
+        sys.exit(1)
+    print("✅ float32 path within the documented tolerance")
+
+if __name__ == "__main__":
+    main()
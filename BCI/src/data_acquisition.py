@@ -1,8 +1,5 @@
-import mne
 import time
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 
 ## \class DataAquisition
 #  \brief Handles real-time EEG data acquisition from an EDF file, visualization, and communication with processing module.
@@ -15,12 +12,18 @@ class DataAquisition:
     #  \param file_path Path to the .edf EEG file.
     #  \param queue Multiprocessing queue for sending data to ScanProcessing.
     #  \param window_size Time window (in seconds) for the scrolling EEG plot.
-    def __init__(self, file_path, queue, window_size=5):
+    #  \param dtype Sample dtype used for the playback buffers and the data sent to ScanProcessing.
+    #  \param profiler Optional ProcessProfiler for the playback loop, toggled by SIGUSR1.
+    #  \param control_queue Optional queue of GUI commands; see poll_control().
+    def __init__(self, file_path, queue, window_size=5, dtype='float32', profiler=None, control_queue=None):
         self.file_path = file_path
+        self.dtype = np.dtype(dtype)  # MNE loads float64; EEG precision does not need it
         self.raw = None
         self.sampling_rate = None
         self.window_size = window_size  # Time window in seconds for scrolling plot
         self.queue = queue  # Queue for sending data to ScanProcessing
+        self.profiler = profiler  # On-demand cProfile/tracemalloc capture
+        self.control_queue = control_queue  # Live channel/band changes from the GUI
         self.fig, self.ax = None, None
         self.lines = []
         self.data_buffer = None
@@ -32,6 +35,8 @@ class DataAquisition:
     #  \return Raw MNE object containing EEG data, or None on failure.
     def read_edf(self):
         """Reads EEG data from an EDF file"""
+        import mne  # Imported on first use; only the acquisition process needs it
+
         try:
             self.raw = mne.io.read_raw_edf(self.file_path, preload=True)
             self.sampling_rate = int(self.raw.info['sfreq'])
@@ -44,31 +49,92 @@ class DataAquisition:
             return None
 
     ## \brief Selects specific EEG channels from the loaded EDF data for playback and visualization.
-    #  \param channel_names List of EEG channel names to select.
+    #
+    #  The full recording stays loaded in raw, so the selection can be changed during playback.
+    #
+    #  \param channel_names List of EEG channel names to select, in row order.
+    #  \return True if the selection was applied.
     def select_channels(self, channel_names):
         """Selects specific EEG channels for playback"""
         if self.raw is None:
             print("No EDF file loaded. Call read_edf() first.")
-            return
+            return False
         
         available_channels = self.raw.ch_names
-        self.selected_channels = [ch for ch in channel_names if ch in available_channels]
+        selected_channels = [ch for ch in channel_names if ch in available_channels]
 
-        if not self.selected_channels:
+        if not selected_channels:
             print("Error: None of the selected channels exist in this EDF file.")
-            return
+            return False
 
-        self.raw = self.raw.pick_channels(self.selected_channels)
-        self.selected_data, times = self.raw.get_data(return_times=True)
+        self.selected_channels = selected_channels
+        self.selected_data = np.ascontiguousarray(self.raw.get_data(picks=self.selected_channels), dtype=self.dtype)
 
         self.time_buffer = np.linspace(0, self.window_size, int(self.sampling_rate * self.window_size))
 
         print(f"Selected Channels: {self.selected_channels}")
-        print(f"Data Shape: {self.selected_data.shape} (Channels, Samples)")
+        print(f"Data Shape: {self.selected_data.shape} (Channels, Samples), dtype: {self.dtype}")
+        return True
+
+    ## \brief Switches the streamed channels mid-playback and tells ScanProcessing.
+    #
+    #  The reconfigure message is forwarded in-band on the data queue so ScanProcessing sees it
+    #  exactly between the last old-pair sample and the first new-pair sample. When the pair
+    #  changes, the new pair's recent history is attached as 'backfill' so the processor can
+    #  warm up from it instead of waiting for a fresh epoch.
+    #
+    #  \param message Reconfigure command from the GUI.
+    #  \param sent Number of samples already sent to ScanProcessing.
+    def reconfigure(self, message, sent):
+        """Applies a channel pair change and forwards the command to ScanProcessing."""
+        forwarded = {k: v for k, v in message.items() if k != "asymmetry_channels"}
+        channels = message.get("asymmetry_channels")
+
+        if channels is not None and list(channels) != self.selected_channels:
+            if len(channels) != len(self.selected_channels) or not all(ch in self.raw.ch_names for ch in channels):
+                print(f"❌ Rejected channel change: {channels} not available in this EDF file")
+            else:
+                self.selected_channels = list(channels)
+                self.selected_data = np.ascontiguousarray(self.raw.get_data(picks=self.selected_channels), dtype=self.dtype)
+
+                # Refill the plot with the new pair's history and hand the same history to the processor
+                buffer_size = self.data_buffer.shape[1]
+                history = self.selected_data[:, max(0, sent - buffer_size):sent]
+                self.data_buffer[:] = 0
+                self.data_buffer[:, buffer_size - history.shape[1]:] = history
+                for ax, name in zip(self.ax, self.selected_channels):
+                    ax.set_ylabel(name)
+                self.fig.canvas.draw_idle()
+
+                forwarded["backfill"] = history
+                forwarded["selected_channel_names"] = self.selected_channels
+                print(f"🔄 Streaming channels: {self.selected_channels}")
+
+        self.queue.put(forwarded)
+
+    ## \brief Drains the GUI control queue.
+    #
+    #  'reconfigure' commands are applied here (see reconfigure()); every other command, such as
+    #  'profile', is forwarded in-band to ScanProcessing.
+    #
+    #  \param sent Number of samples already sent to ScanProcessing.
+    def poll_control(self, sent):
+        """Applies pending GUI commands."""
+        if self.control_queue is None:
+            return
+
+        while not self.control_queue.empty():
+            message = self.control_queue.get()
+            if isinstance(message, dict) and message.get("command") == "reconfigure":
+                self.reconfigure(message, sent)
+            else:
+                self.queue.put(message)
 
     ## \brief Initializes the real-time scrolling EEG plot using Matplotlib.
     def setup_plot(self):
         """Initializes the real-time EEG plot"""
+        import matplotlib.pyplot as plt
+
         num_channels = len(self.selected_channels)
         self.fig, self.ax = plt.subplots(num_channels, 1, figsize=(10, 6), sharex=True)
 
@@ -100,20 +166,30 @@ class DataAquisition:
     #  sending 1-sample-wide slices to the processing pipeline via a multiprocessing queue.
     def play_real_time(self):
         """Simulates real-time EEG scanning with visualization and sends data to ScanProcessing"""
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+
         if self.raw is None or self.selected_data is None:
             print("No EDF file loaded or no channels selected. Call read_edf() and select_channels() first.")
             return
 
         num_channels, num_samples = self.selected_data.shape
         buffer_size = int(self.sampling_rate * self.window_size)
-        self.data_buffer = np.zeros((num_channels, buffer_size))
+        self.data_buffer = np.zeros((num_channels, buffer_size), dtype=self.dtype)
 
         self.setup_plot()
 
+        if self.profiler is not None:
+            self.profiler.install_signal_handler()
+
         def data_generator():
             for i in range(num_samples):
                 time.sleep(1 / self.sampling_rate)
 
+                if self.profiler is not None:
+                    self.profiler.poll()
+                self.poll_control(i)
+
                 self.data_buffer = np.roll(self.data_buffer, -1, axis=1)
                 new_values = self.selected_data[:, i]
                 self.data_buffer[:, -1] = new_values
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import QApplication, QLabel, QWidget, QVBoxLayout, QPushBut
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QPixmap, QFont
 import multiprocessing
-import subprocess
+from vr_control import VRWorldClient
 
 ## \class EegInterface
 #  \brief Provides a GUI interface for EEG session configuration, score display, and VR interaction.
@@ -16,9 +16,13 @@ import subprocess
 class EegInterface(QWidget):
     ## \brief Constructor for EegInterface.
     #  \param queue Multiprocessing queue for receiving updates (e.g., asymmetry scores).
-    def __init__(self, queue):
+    #  \param control_queue Optional multiprocessing queue for reconfiguring the running pipeline.
+    def __init__(self, queue, control_queue=None):
         super().__init__()
         self.queue = queue  # Queue to receive scores from ScanProcessing
+        self.control_queue = control_queue  # Queue to send live band/channel changes
+        self.scenario_running = False  # Set once the start command has been sent
+        self.vr_world = VRWorldClient()  # Persistent VR world process, started hidden below
         self.file_path = None  # Store the selected file path
         self.selected_channels = None  # Store the selected EEG channels
         self.low_cut = 8  # Default low cut-off frequency
@@ -51,11 +55,13 @@ class EegInterface(QWidget):
         # Channel selection dropdowns
         self.channel1_dropdown = QComboBox(self)
         self.channel1_dropdown.addItems(self.available_channels)
+        self.channel1_dropdown.currentTextChanged.connect(self.update_channels)
         self.layout.addWidget(QLabel("Select Channel 1:"))
         self.layout.addWidget(self.channel1_dropdown)
 
         self.channel2_dropdown = QComboBox(self)
         self.channel2_dropdown.addItems(self.available_channels)
+        self.channel2_dropdown.currentTextChanged.connect(self.update_channels)
         self.layout.addWidget(QLabel("Select Channel 2:"))
         self.layout.addWidget(self.channel2_dropdown)
         
@@ -87,6 +93,12 @@ class EegInterface(QWidget):
         self.run_button.clicked.connect(self.start_scenario)
         self.layout.addWidget(self.run_button)
 
+        # Profile button (enabled once the scenario is running)
+        self.profile_button = QPushButton("Profile Processing (10 s)", self)
+        self.profile_button.setEnabled(False)
+        self.profile_button.clicked.connect(self.request_profile)
+        self.layout.addWidget(self.profile_button)
+
         # Launch VR World Button
         self.vr_button = QPushButton("Launch VR World", self)
         self.vr_button.clicked.connect(self.launch_vr_world)
@@ -133,6 +145,9 @@ class EegInterface(QWidget):
         self.timer.timeout.connect(self.check_for_updates)
         self.timer.start(100)  # Check every 100 ms
 
+        # Pre-warm the VR world so showing it later is instant
+        self.vr_world.start(hidden=True)
+
         print("✅ GUI Initialization Complete")
 
     ## \brief Handles changes to the lighting control slider and updates external file.
@@ -173,6 +188,8 @@ class EegInterface(QWidget):
         print(f"🔄 Updated Low Cut Frequency: {self.low_cut} Hz")
         if self.low_cut >= self.high_cut:
             self.high_cut_dropdown.setCurrentText(str(self.low_cut + 1))  # Ensure high_cut is always greater
+        else:
+            self.send_reconfigure()
 
     ## \brief Updates the high cutoff frequency for bandpass filtering.
     #  \param value New high cutoff value as a string.
@@ -182,6 +199,40 @@ class EegInterface(QWidget):
         print(f"🔄 Updated High Cut Frequency: {self.high_cut} Hz")
         if self.high_cut <= self.low_cut:
             self.low_cut_dropdown.setCurrentText(str(self.high_cut - 1))  # Ensure low_cut is always smaller
+        else:
+            self.send_reconfigure()
+
+    ## \brief Handles a change of either asymmetry channel dropdown.
+    #  \param value New channel name (unused; both dropdowns are read).
+    def update_channels(self, value):
+        """Forwards channel pair changes to the running scenario."""
+        self.send_reconfigure()
+
+    ## \brief Sends the current band and channel pair to the running ScanProcessing.
+    #
+    #  Does nothing until the scenario has been started, since the settings are then
+    #  sent as part of the start command instead.
+    def send_reconfigure(self):
+        """Hot-swaps the band and channel pair of the running scenario."""
+        if not self.scenario_running or self.control_queue is None:
+            return
+
+        channels = (self.channel1_dropdown.currentText(), self.channel2_dropdown.currentText())
+        self.control_queue.put({
+            "command": "reconfigure",
+            "low_cut": self.low_cut,
+            "high_cut": self.high_cut,
+            "asymmetry_channels": channels
+        })
+        print(f"📤 Reconfigure sent: channels {channels}, bandpass {self.low_cut}-{self.high_cut} Hz")
+
+    ## \brief Asks ScanProcessing to capture a profile (started, or stopped early if one is running).
+    def request_profile(self):
+        """Toggles a cProfile/tracemalloc capture in the processing process."""
+        if not self.scenario_running or self.control_queue is None:
+            return
+        self.control_queue.put({"command": "profile"})
+        print("📤 Profile toggle sent to ScanProcessing")
 
     ## \brief Sends a command to start the EEG scenario with the current config.
     def start_scenario(self):
@@ -189,6 +240,8 @@ class EegInterface(QWidget):
         if self.file_path:
             print("📤 Sending start command to main process...")
             self.run_button.setEnabled(False)  # Prevent multiple clicks
+            self.scenario_running = True  # Band/channel changes are now sent live
+            self.profile_button.setEnabled(self.control_queue is not None)
             self.selected_channels = (
                 self.available_channels.index(self.channel1_dropdown.currentText()),
                 self.available_channels.index(self.channel2_dropdown.currentText())
@@ -205,12 +258,19 @@ class EegInterface(QWidget):
     ## \brief Periodically checks the multiprocessing queue for incoming messages.
     def check_for_updates(self):
         """Periodically checks for score updates from the queue."""
+        latest_score = None
         while not self.queue.empty():
             message = self.queue.get()
             print(f"📥 GUI received: {message}")  # Debugging
 
             if isinstance(message, dict) and "score" in message:
                 self.update_score(message["score"])
+                latest_score = message["score"]
+
+        # Deliver commands queued while the VR world was starting, then the newest score
+        self.vr_world.flush()
+        if latest_score is not None:
+            self.vr_world.set_score(latest_score)
 
     ## \brief Updates the displayed score and emoji based on the latest value.
     #  \param score Float or string score from ScanProcessing.
@@ -243,7 +303,21 @@ class EegInterface(QWidget):
         else:
             self.emoji_label.setPixmap(self.saddest_face.scaled(80, 80, Qt.KeepAspectRatio))
 
-    ## \brief Launches the Panda3D VR world as a subprocess.
+    ## \brief Shuts the VR world down with the GUI so no Panda3D process is left running.
+    #  \param event Qt close event.
+    def closeEvent(self, event):
+        """Stops the VR world when the GUI window closes."""
+        print("🛑 Closing GUI, shutting down VR World...")
+        self.vr_world.shutdown()
+        super().closeEvent(event)
+
+    ## \brief Shows or hides the persistent Panda3D VR world, starting it if it is not running.
     def launch_vr_world(self):
-        print("🚀 Launching VR World...")
-        subprocess.Popen(["/bin/python3", "/home/jarred/git/Brainground/BCI/src/vr_world.py"])
+        if self.vr_world.visible:
+            print("🙈 Hiding VR World...")
+            self.vr_world.hide()
+            self.vr_button.setText("Show VR World")
+        else:
+            print("🚀 Showing VR World...")
+            self.vr_world.show()
+            self.vr_button.setText("Hide VR World")
@@ -5,23 +5,44 @@
 #  then coordinates EEG data acquisition, filtering, epoching, and asymmetry score
 #  processing using multiprocessing. It connects the GUI, DataAquisition, and
 #  ScanProcessing components into a functional pipeline.
+#
+#  Heavy modules are imported inside the function that runs in each process. Under the
+#  spawn start method every child re-imports this module, so keeping its top level light
+#  means the processor never loads Qt, MNE or Matplotlib, and the GUI never loads MNE/SciPy.
 
 from multiprocessing import Process, Queue
-from data_acquisition import DataAquisition
-from scan_processing import ScanProcessing
-from eeg_interface import EegInterface
+from profiling import ProcessProfiler
 import time
-from PyQt5.QtWidgets import QApplication
+
+## \brief Sample dtype used end to end by acquisition, transport, filtering and PSD.
+PIPELINE_DTYPE = 'float32'
 
 ## \brief Runs the PyQt5 GUI in a separate process.
 #  \param queue Multiprocessing queue used to receive messages from GUI (e.g., start command).
-def run_gui(queue):
+#  \param control_queue Multiprocessing queue the GUI uses to reconfigure the running pipeline.
+def run_gui(queue, control_queue=None):
     """Runs the GUI in a separate process."""
+    from PyQt5.QtWidgets import QApplication
+    from eeg_interface import EegInterface
+
     app = QApplication([])
-    interface = EegInterface(queue)
+    interface = EegInterface(queue, control_queue)
     interface.show()
     app.exec_()
 
+## \brief Runs ScanProcessing in a separate process.
+#
+#  ScanProcessing is constructed inside the child so only the NumPy/SciPy processing stack
+#  is imported there.
+#
+#  \param processor_kwargs Keyword arguments for the ScanProcessing constructor (queues included).
+def run_processor(processor_kwargs):
+    """Runs the EEG processor in a separate process."""
+    from scan_processing import ScanProcessing
+
+    scan_processing = ScanProcessing(**processor_kwargs)
+    scan_processing.process_data()
+
 ## \brief Main function that initializes and manages all components of the BCI pipeline.
 #
 #  This function:
@@ -33,9 +54,10 @@ def main():
     # Create queues for inter-process communication
     data_queue = Queue()
     gui_queue = Queue()  # Queue for GUI communication
+    control_queue = Queue()  # Queue for live reconfiguration (GUI -> DataAquisition -> ScanProcessing)
 
     # Start GUI in a separate process
-    gui_process = Process(target=run_gui, args=(gui_queue,))
+    gui_process = Process(target=run_gui, args=(gui_queue, control_queue))
     gui_process.start()
     
     print("🟢 Waiting for user to select an EEG file, channels, and bandpass filter range...")
@@ -79,39 +101,44 @@ def main():
     print(f"✅ Selected Asymmetry Channels: {asymmetry_channels}")
     print(f"✅ Selected Bandpass Filter: {low_cut}-{high_cut} Hz")
     
-    # Create DataAquisition and ScanProcessing instances
-    data_acquisition = DataAquisition(file_path, data_queue)
+    session_id = time.strftime("%Y%m%d-%H%M%S")  # Tags profile output of this run
 
-    # Convert selected channel names to their index in the full EEG list
-    selected_channel_indices = [
-        available_channels.index(asymmetry_channels[0]), 
-        available_channels.index(asymmetry_channels[1])
-    ]
-
-    # Pass these indices to `ScanProcessing`
-    scan_processing = ScanProcessing(
-        data_queue, 
-        gui_queue, 
+    # Pass the asymmetry pair chosen in the GUI to `ScanProcessing`
+    processor_kwargs = dict(
+        queue=data_queue, 
+        gui_queue=gui_queue, 
         filter_type='bandpass', 
         low_cut=low_cut, 
         high_cut=high_cut, 
         epoch_duration=1, 
         epoch_interval=0.5, 
         moving_avg_epochs=4, 
-        asymmetry_channels=[0, 1],  # ✅ Adjusted to be relative to the extracted PSD data
-        selected_channel_names=asymmetry_channels
+        asymmetry_channels=[0, 1],  # ✅ Relative to the streamed data rows
+        selected_channel_names=list(asymmetry_channels),
+        dtype=PIPELINE_DTYPE,
+        profiler=ProcessProfiler("scan_processing", session_id)
     )
 
-    # Start ScanProcessing in a separate process
-    scan_process = Process(target=scan_processing.process_data)
+    # Start ScanProcessing before loading the EDF so its imports overlap the load
+    scan_process = Process(target=run_processor, args=(processor_kwargs,))
     scan_process.start()
 
-    # Read the EDF file, select channels, and start real-time playback
+    # Create DataAquisition and read the EDF file (MNE is only needed in this process)
+    from data_acquisition import DataAquisition
+
+    data_acquisition = DataAquisition(
+        file_path, 
+        data_queue, 
+        dtype=PIPELINE_DTYPE, 
+        profiler=ProcessProfiler("data_acquisition", session_id),
+        control_queue=control_queue  # Channel/band changes; forwarded in-band to ScanProcessing
+    )
     data_acquisition.read_edf()
     print(f"✅ Available Channels: {data_acquisition.raw.ch_names}")
-    data_acquisition.select_channels([asymmetry_channels[0], asymmetry_channels[1]])
 
-    if data_acquisition.selected_data is None:
+    # Stream only the asymmetry pair; DataAquisition switches rows if the GUI changes it
+    if not data_acquisition.select_channels([asymmetry_channels[0], asymmetry_channels[1]]) or \
+            data_acquisition.selected_channels != list(asymmetry_channels):
         print("❌ ERROR: No valid EEG channels were selected! Exiting...")
         scan_process.terminate()
         gui_process.terminate()
@@ -0,0 +1,135 @@
+## \file profiling.py
+#  \brief On-demand profiling of the pipeline processes.
+#
+#  Each pipeline process (ScanProcessing, DataAquisition playback) owns a ProcessProfiler.
+#  A capture is started at runtime with SIGUSR1 or a control message, runs for a bounded
+#  window, and writes cProfile stats plus a tracemalloc allocation diff to files named
+#  after the process and the session id.
+
+import cProfile
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+
+## \brief Default directory for profile output files.
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles")
+
+## \class ProcessProfiler
+#  \brief Captures cProfile and tracemalloc data for one process over a bounded window.
+#
+#  The owning process calls poll() from its main loop. The signal handler only records a
+#  toggle request; poll() starts/stops captures, so the slow stop() never runs inside a
+#  signal handler or re-enters itself.
+class ProcessProfiler:
+    ## \brief Constructor for ProcessProfiler.
+    #  \param name Process name used in output file names (e.g., 'scan_processing').
+    #  \param session_id Session identifier shared by all processes of one run.
+    #  \param window Default capture length in seconds.
+    #  \param output_dir Directory profile files are written to.
+    #  \param top_allocations Number of allocation sites listed in the memory report.
+    def __init__(self, name, session_id, window=10.0, output_dir=PROFILE_DIR, top_allocations=25):
+        self.name = name
+        self.session_id = session_id
+        self.window = window
+        self.output_dir = output_dir
+        self.top_allocations = top_allocations
+        self.profile = None
+        self.start_snapshot = None
+        self.deadline = None
+        self.owns_tracing = False  # Leave tracemalloc running if something else started it
+        self.toggle_requested = False  # Set by the signal handler, acted on by poll()
+
+    ## \brief Whether a capture is currently running.
+    @property
+    def active(self):
+        return self.profile is not None
+
+    ## \brief Installs a signal handler that requests a capture toggle (SIGUSR1 by default).
+    #
+    #  The toggle takes effect on the next poll(). Must be called from the main thread of the
+    #  process being profiled. Does nothing on platforms without the signal (e.g., Windows),
+    #  where the control message still works.
+    #
+    #  \param signum Signal number, or None for SIGUSR1.
+    def install_signal_handler(self, signum=None):
+        signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+        if signum is None:
+            return
+        signal.signal(signum, self.request_toggle)
+        print(f"🩺 {self.name} profiling: send signal {signum} to pid {os.getpid()} to toggle")
+
+    ## \brief Signal handler: asks poll() to toggle a capture.
+    #  \param signum Received signal number.
+    #  \param frame Interrupted stack frame (unused).
+    def request_toggle(self, signum=None, frame=None):
+        self.toggle_requested = True
+
+    ## \brief Starts a capture, or stops the running one early.
+    #  \param duration Capture length in seconds (defaults to the profiler window).
+    def toggle(self, duration=None):
+        if self.active:
+            self.stop()
+        else:
+            self.start(duration)
+
+    ## \brief Starts a bounded capture.
+    #  \param duration Capture length in seconds (defaults to the profiler window).
+    def start(self, duration=None):
+        if self.active:
+            return
+        duration = self.window if duration is None else duration
+        self.owns_tracing = not tracemalloc.is_tracing()
+        if self.owns_tracing:
+            tracemalloc.start()
+        self.start_snapshot = tracemalloc.take_snapshot()
+        self.deadline = time.monotonic() + duration
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        print(f"🩺 {self.name} profiling started for {duration}s")
+
+    ## \brief Applies a requested toggle and ends the capture once its window has elapsed.
+    #
+    #  Call from the process main loop.
+    def poll(self):
+        if self.toggle_requested:
+            self.toggle_requested = False
+            self.toggle()
+        elif self.active and time.monotonic() >= self.deadline:
+            self.stop()
+
+    ## \brief Stops the capture and writes the profile files.
+    #  \return Base path of the written files, or None if no capture was running.
+    def stop(self):
+        if not self.active:
+            return None
+        self.profile.disable()
+        end_snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self.owns_tracing:
+            tracemalloc.stop()
+
+        base_path = os.path.join(self.output_dir, f"{self.name}_{self.session_id}_{time.strftime('%H%M%S')}")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+
+            # cProfile stats: binary for snakeviz/pstats, text sorted by cumulative time
+            self.profile.dump_stats(base_path + ".prof")
+            with open(base_path + ".prof.txt", "w") as f:
+                pstats.Stats(self.profile, stream=f).sort_stats("cumulative").print_stats(50)
+
+            # tracemalloc: allocations that grew during the window, by source line
+            end_snapshot.dump(base_path + ".tracemalloc")
+            with open(base_path + ".mem.txt", "w") as f:
+                f.write(f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+                for stat in end_snapshot.compare_to(self.start_snapshot, "lineno")[:self.top_allocations]:
+                    f.write(f"{stat}\n")
+            print(f"🩺 {self.name} profile written to {base_path}.*")
+        except Exception as e:
+            print(f"❌ Failed to write {self.name} profile: {e}")
+        finally:
+            self.profile = None
+            self.start_snapshot = None
+            self.deadline = None
+        return base_path
@@ -1,8 +1,9 @@
 import numpy as np
 import scipy.signal
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from collections import deque
+from queue import Empty
+
+## \brief Documented bound on |score(float32) - score(float64)| on the 0–100 scale.
+DTYPE_SCORE_TOLERANCE = 1e-3
 
 ## \class ScanProcessing
 #  \brief Processes real-time EEG data including filtering, epoching, and asymmetry score calculation.
@@ -21,19 +22,36 @@ class ScanProcessing:
     #  \param epoch_duration Duration of each epoch (seconds).
     #  \param epoch_interval Time interval between epochs (seconds).
     #  \param moving_avg_epochs Number of epochs to average for smoothing.
-    #  \param asymmetry_channels Tuple of two EEG channel indices to use for asymmetry score.
-    #  \param selected_channel_names Optional list of channel names or indices being processed.
+    #  \param asymmetry_channels Tuple of two row indices (into the streamed channels) to use for asymmetry score.
+    #  \param selected_channel_names Names of the channels streamed by DataAquisition, in row order.
+    #  \param dtype Sample dtype used for buffering, transport and PSD estimation (filtering always runs in float64).
+    #  \param control_queue Optional separate queue for commands (see handle_command()); in the full pipeline
+    #         commands arrive in-band on queue, forwarded by DataAquisition.
+    #  \param profiler Optional ProcessProfiler toggled by SIGUSR1 or a 'profile' control command.
+    #
+    #  The bandpass is designed and applied in float64, since narrow low-frequency SOS sections lose
+    #  too much precision in float32, and the filtered window is then cast back to dtype. With the
+    #  default float32 data path the mapped score stays within DTYPE_SCORE_TOLERANCE (on the 0–100
+    #  scale) of the float64 result for every band the GUI offers (1–50 Hz), including input with a
+    #  DC offset; check_dtype_tolerance.py verifies this. Pass dtype='float64' for a bit-for-bit
+    #  comparison with offline analysis.
     def __init__(self, queue, gui_queue, filter_type='bandpass', low_cut=10, high_cut=13, sampling_rate=256, 
-                 epoch_duration=1, epoch_interval=0.5, moving_avg_epochs=4, asymmetry_channels=None, selected_channel_names=[0, 1]):
+                 epoch_duration=1, epoch_interval=0.5, moving_avg_epochs=4, asymmetry_channels=None, selected_channel_names=[0, 1],
+                 dtype='float32', control_queue=None, profiler=None):
         self.queue = queue  
         self.gui_queue = gui_queue  # Queue for sending data to GUI
+        self.control_queue = control_queue  # Optional out-of-band command queue
+        self.profiler = profiler  # On-demand cProfile/tracemalloc capture
         self.filter_type = filter_type  
         self.low_cut = low_cut
         self.high_cut = high_cut
         self.sampling_rate = sampling_rate
         self.selected_channel_names = selected_channel_names  
+        self.dtype = np.dtype(dtype)
         self.buffer = []  
         self.min_samples = 27  
+        self.filter_order = 4
+        self.sos = self.design_filter()
 
         # Epoching settings
         self.epoch_duration = epoch_duration
@@ -48,14 +66,18 @@ class ScanProcessing:
         # Asymmetry DSP settings
         self.asymmetry_channels = asymmetry_channels  
 
+    ## \brief Designs the bandpass Butterworth filter as second-order sections.
+    #  \return float64 SOS coefficient array.
+    def design_filter(self):
+        """Designs the bandpass SOS filter for the configured band."""
+        nyquist = 0.5 * self.sampling_rate
+        return scipy.signal.butter(self.filter_order, [self.low_cut / nyquist, self.high_cut / nyquist], btype='band', output='sos')
+
     ## \brief Applies a bandpass Butterworth filter to EEG data.
     #  \param data Raw EEG signal (2D array: channels x samples).
     #  \return Filtered EEG data.
     def apply_filter(self, data):
         """Applies a bandpass filter for upper alpha waves (10-13 Hz)."""
-        nyquist = 0.5 * self.sampling_rate
-        filter_order = 4  
-
         if len(data.shape) == 1:
             data = data.reshape(1, -1)  # Ensure 2D shape [channels, samples]
 
@@ -63,8 +85,9 @@ class ScanProcessing:
             print(f"Not enough data for filtering ({data.shape[1]} samples). Waiting for more...")
             return data
 
-        b, a = scipy.signal.butter(filter_order, [self.low_cut / nyquist, self.high_cut / nyquist], btype='band')
-        return scipy.signal.filtfilt(b, a, data, axis=1)
+        # Filter in float64 (one short window, so the cost is negligible) and hand back the processing dtype
+        filtered = scipy.signal.sosfiltfilt(self.sos, data.astype(np.float64), axis=1, padlen=self.min_samples)
+        return filtered.astype(self.dtype)
 
     ## \brief Splits filtered EEG signal into overlapping epochs.
     #  \param filtered_data Bandpass filtered EEG signal (channels x samples).
@@ -79,7 +102,7 @@ class ScanProcessing:
             epoch = filtered_data[:, start:start + self.epoch_samples]
             epochs.append(epoch)
 
-        epochs = np.array(epochs)
+        epochs = np.array(epochs, dtype=self.dtype)
         print(f"✅ Extracted Epochs Shape: {epochs.shape} (Epochs, Channels, Samples)")
         return epochs
 
@@ -99,7 +122,7 @@ class ScanProcessing:
                 psd_epoch.append(np.mean(psd[upper_alpha_idx]))
             psd_list.append(psd_epoch)
         
-        return np.array(psd_list)  # Shape: (epochs, channels)
+        return np.array(psd_list, dtype=self.dtype)  # Shape: (epochs, channels)
 
     ## \brief Computes the FAA-based asymmetry score from PSD data and sends result to GUI.
     #  \param psd_data PSD values per epoch (2D array: epochs x channels).
@@ -115,8 +138,9 @@ class ScanProcessing:
             print(f"❌ ERROR: PSD data does not have enough channels ({psd_data.shape[1]} channels). Skipping computation.")
             return
 
-        left_psd = psd_data[:, left_idx]
-        right_psd = psd_data[:, right_idx]
+        # Two values per epoch: take the log ratio in float64 regardless of the processing dtype
+        left_psd = psd_data[:, left_idx].astype(np.float64)
+        right_psd = psd_data[:, right_idx].astype(np.float64)
 
         asymmetry_score = np.log10(right_psd + 1e-10) - np.log10(left_psd + 1e-10)
         avg_score = np.mean(asymmetry_score)
@@ -145,6 +169,113 @@ class ScanProcessing:
         else:
             return min(100, 75 + (faa_score - 0.02) * (25 / 0.08))
 
+    ## \brief Hot-swaps the band, filter design and asymmetry channel pair of the running processor.
+    #
+    #  The new filter is designed immediately and the retained buffer is re-processed with it,
+    #  so a score for the new configuration is produced without waiting for fresh data.
+    #
+    #  \param low_cut New low cutoff frequency (unchanged if None).
+    #  \param high_cut New high cutoff frequency (unchanged if None).
+    #  \param asymmetry_channels New channel pair, as names from selected_channel_names or row indices (unchanged if None).
+    #  \param backfill History of newly streamed channels (channels x samples) that replaces the retained
+    #         buffer; sent by DataAquisition when it switches the streamed pair.
+    #  \param selected_channel_names Names of the newly streamed channels, sent along with backfill.
+    #  \return True if the new configuration was applied, False if it was rejected.
+    def reconfigure(self, low_cut=None, high_cut=None, asymmetry_channels=None, backfill=None, selected_channel_names=None):
+        """Applies a new band and/or channel pair without restarting the pipeline."""
+        # Upstream has already switched rows, so the old buffer is stale whatever happens below
+        if backfill is not None:
+            self.buffer = [np.asarray(backfill, dtype=self.dtype)]
+        if selected_channel_names is not None:
+            self.selected_channel_names = list(selected_channel_names)
+
+        low_cut = self.low_cut if low_cut is None else low_cut
+        high_cut = self.high_cut if high_cut is None else high_cut
+
+        if not 0 < low_cut < high_cut < 0.5 * self.sampling_rate:
+            print(f"❌ Rejected reconfiguration: invalid band {low_cut}-{high_cut} Hz")
+            return False
+
+        channels = self.asymmetry_channels
+        if asymmetry_channels is not None:
+            try:
+                channels = [
+                    self.selected_channel_names.index(ch) if isinstance(ch, str) else int(ch)
+                    for ch in asymmetry_channels
+                ]
+            except ValueError:
+                print(f"❌ Rejected reconfiguration: channels {asymmetry_channels} are not being streamed")
+                return False
+            if len(channels) != 2 or not all(0 <= ch < len(self.selected_channel_names) for ch in channels):
+                print(f"❌ Rejected reconfiguration: invalid channel pair {asymmetry_channels}")
+                return False
+
+        self.low_cut = low_cut
+        self.high_cut = high_cut
+        self.asymmetry_channels = channels
+        self.sos = self.design_filter()
+        self.epoch_history = []
+        print(f"🔄 Reconfigured: {self.filter_type} filter {self.low_cut}-{self.high_cut} Hz, channels {self.selected_channel_names}")
+
+        # Warm start: score the retained buffer with the new settings straight away
+        if self.buffer:
+            data_array = np.hstack(self.buffer)
+            if data_array.shape[1] >= self.epoch_samples:
+                self.process_window(data_array)
+        return True
+
+    ## \brief Applies one command received on the control queue or in-band on the data queue.
+    #
+    #  Supported commands are 'reconfigure' (see reconfigure()) and 'profile', which toggles
+    #  a profiler capture with an optional 'duration' in seconds.
+    #
+    #  \param message Command dictionary.
+    def handle_command(self, message):
+        """Applies a single control command."""
+        command = message.get("command") if isinstance(message, dict) else None
+        if command == "reconfigure":
+            self.reconfigure(
+                low_cut=message.get("low_cut"),
+                high_cut=message.get("high_cut"),
+                asymmetry_channels=message.get("asymmetry_channels"),
+                backfill=message.get("backfill"),
+                selected_channel_names=message.get("selected_channel_names")
+            )
+        elif command == "profile":
+            if self.profiler is None:
+                print("⚠️ Profiling not enabled for this process")
+            else:
+                self.profiler.toggle(message.get("duration"))
+        else:
+            print(f"⚠️ Unknown control message: {message}")
+
+    ## \brief Drains the control queue and applies any pending commands.
+    def poll_control(self):
+        """Applies pending commands from the control queue."""
+        if self.profiler is not None:
+            self.profiler.poll()
+
+        if self.control_queue is None:
+            return
+
+        while not self.control_queue.empty():
+            self.handle_command(self.control_queue.get())
+
+    ## \brief Filters, epochs and scores one window of buffered EEG data.
+    #  \param data_array Buffered EEG data for all streamed channels (channels x samples).
+    def process_window(self, data_array):
+        """Runs filtering, epoching, PSD and asymmetry scoring on the asymmetry channel pair."""
+        if self.asymmetry_channels is None:
+            pair_data = data_array
+        else:
+            pair_data = data_array[list(self.asymmetry_channels), :]
+        filtered_data = self.apply_filter(pair_data)
+        epochs = self.extract_epochs(filtered_data)
+
+        if epochs.size > 0:
+            psd_data = self.compute_psd_welch(epochs)
+            self.compute_asymmetry_score(psd_data)
+
     ## \brief Main processing loop that handles streaming EEG data end-to-end.
     #
     #  This method continuously receives new data, applies filtering, epoching,
@@ -154,16 +285,30 @@ class ScanProcessing:
         print(f"ScanProcessing started with {self.filter_type} filter: {self.low_cut}-{self.high_cut} Hz")
         print(f"Epoching: {self.epoch_duration}s epochs every {self.epoch_interval}s")
         print(f"Asymmetry DSP enabled on channels: {self.asymmetry_channels}")
+        print(f"Processing dtype: {self.dtype}")
+
+        if self.profiler is not None:
+            self.profiler.install_signal_handler()
 
         while True:
-            new_data = self.queue.get()
+            self.poll_control()
+
+            try:
+                new_data = self.queue.get(timeout=0.1)
+            except Empty:
+                continue
+
+            # Commands forwarded by DataAquisition arrive in order with the samples
+            if isinstance(new_data, dict):
+                self.handle_command(new_data)
+                continue
             print(f"🔍 Received New Data - Shape: {new_data.shape}")  # Debugging
 
             if new_data.shape[0] < 2:
                 print("❌ Error: Not enough EEG channels detected before processing!")
                 continue
 
-            self.buffer.append(new_data)
+            self.buffer.append(np.asarray(new_data, dtype=self.dtype))
             data_array = np.hstack(self.buffer)
 
             if data_array.shape[1] > self.epoch_samples * 10:
@@ -174,11 +319,6 @@ class ScanProcessing:
                 continue
 
             print(f"✅ Processing Data - Shape: {data_array.shape}")  # Debugging
-            filtered_data = self.apply_filter(data_array)
-            epochs = self.extract_epochs(filtered_data)
-
-            if epochs.size > 0:
-                psd_data = self.compute_psd_welch(epochs)
-                self.compute_asymmetry_score(psd_data)
+            self.process_window(data_array)
 
             self.buffer = [data_array[:, -self.epoch_samples:]]
@@ -0,0 +1,206 @@
+## \file vr_control.py
+#  \brief Local IPC interface to the persistent VR world process.
+#
+#  The VR world runs as a single long-lived Panda3D process that listens on a per-user
+#  AF_UNIX socket. This module holds the socket location, the message encoding, and a
+#  lightweight client the GUI uses to start the process once, show or hide it, and push
+#  scores to it. It does not import Panda3D, so the GUI does not pay for the VR stack.
+#
+#  Messages are newline-delimited JSON objects such as {"command": "score", "value": 72.5}.
+#  Nothing is unpickled, and the socket is only reachable by the owning user: it is created
+#  with mode 0600 in the user's runtime directory, and clients refuse sockets owned by anyone else.
+#
+#  Lifecycle: the GUI starts one VR world (hidden) at start-up, shows and hides it on demand,
+#  and shuts it down when its window closes. The VR world also exits on its own if the process
+#  that launched it dies, so a crashed GUI does not leave it running.
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+
+## \brief Commands the VR world accepts.
+VR_COMMANDS = ("show", "hide", "score", "shutdown")
+
+## \brief Path of the VR world script launched by VRWorldClient.
+VR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vr_world.py")
+
+## \brief Returns the per-user control socket path.
+#
+#  Uses $XDG_RUNTIME_DIR (a 0700 per-user directory) when available, otherwise a
+#  uid-suffixed name in the system temp directory.
+#
+#  \return Absolute socket path.
+def socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "brainground-vr.sock")
+    return os.path.join(tempfile.gettempdir(), f"brainground-vr-{os.getuid()}.sock")
+
+## \brief Encodes one command for the control socket.
+#  \param message Command dictionary.
+#  \return UTF-8 encoded JSON line.
+def encode_message(message):
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+## \brief Decodes and validates one line received on the control socket.
+#  \param line Raw line (bytes or str).
+#  \return Command dictionary, or None if the line is not a valid command.
+def decode_message(line):
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(message, dict) or message.get("command") not in VR_COMMANDS:
+        return None
+    if message["command"] == "score" and not isinstance(message.get("value"), (int, float)):
+        return None
+    return message
+
+## \brief Connects to the control socket if it exists and belongs to the current user.
+#  \param path Socket path.
+#  \return Connected socket, or None.
+def connect_socket(path):
+    try:
+        if os.stat(path).st_uid != os.getuid():
+            print(f"⚠️ Ignoring VR control socket not owned by this user: {path}")
+            return None
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(path)
+        return conn
+    except OSError:
+        return None
+
+## \brief Binds the VR world's control socket with owner-only permissions.
+#
+#  A leftover socket file from a crashed instance is removed; a live one means another
+#  VR world is already running. A file at the path owned by another user is left alone.
+#
+#  \param path Socket path.
+#  \return Listening socket, or None if another instance is already listening.
+#  \throws PermissionError If the path is taken by a file owned by another user.
+def open_listener(path):
+    existing = connect_socket(path)
+    if existing is not None:
+        existing.close()
+        return None
+    if os.path.lexists(path):
+        if os.lstat(path).st_uid != os.getuid():
+            raise PermissionError(f"VR control socket path is owned by another user: {path}")
+        os.unlink(path)  # Stale socket from an instance that did not shut down cleanly
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # Socket file is created 0600
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    listener.listen()
+    return listener
+
+## \class VRWorldClient
+#  \brief Starts, reconnects to, and controls the persistent VR world process.
+#
+#  Commands sent while the VR process is still starting up are kept and delivered
+#  by flush() once the control socket accepts connections.
+class VRWorldClient:
+    ## \brief Constructor for VRWorldClient.
+    #  \param path Control socket path (defaults to socket_path()).
+    def __init__(self, path=None):
+        self.path = path or socket_path()
+        self.conn = None
+        self.process = None
+        self.pending = []  # Commands waiting for the VR world to come up
+        self.visible = False
+
+    ## \brief Starts the VR world unless an instance is already running.
+    #  \param hidden Start with the window hidden (pre-warm).
+    def start(self, hidden=True):
+        """Launches the VR world process once, reusing a running instance if there is one."""
+        if self.connect():
+            return
+        if self.process is not None and self.process.poll() is None:
+            return  # Still starting up
+
+        print("🚀 Starting VR World process...")
+        args = [sys.executable, VR_SCRIPT, "--socket", self.path, "--parent-pid", str(os.getpid())]
+        if hidden:
+            args.append("--hidden")
+        self.process = subprocess.Popen(args)
+        self.visible = not hidden
+
+    ## \brief Opens a control connection to the VR world if one is not already open.
+    #  \return True if connected.
+    def connect(self):
+        """Connects to the VR world control socket."""
+        if self.conn is not None:
+            return True
+        self.conn = connect_socket(self.path)
+        if self.conn is not None:
+            print("🔗 Connected to VR World")
+        return self.conn is not None
+
+    ## \brief Writes one message on the open connection, dropping the connection on failure.
+    #  \param message Command dictionary.
+    #  \return True if the message was written.
+    def write(self, message):
+        try:
+            self.conn.sendall(encode_message(message))
+            return True
+        except OSError as e:
+            print(f"⚠️ Lost connection to VR World: {e}")
+            self.conn.close()
+            self.conn = None
+            return False
+
+    ## \brief Sends a command to the VR world, queueing it if the VR world is not reachable yet.
+    #  \param command Command name (one of VR_COMMANDS).
+    #  \param kwargs Extra fields for the command message.
+    def send(self, command, **kwargs):
+        """Sends a control command to the VR world."""
+        self.pending.append({"command": command, **kwargs})
+        self.flush()
+
+    ## \brief Delivers queued commands once the VR world accepts connections.
+    def flush(self):
+        """Sends any pending commands to the VR world."""
+        if not self.pending or not self.connect():
+            return
+        while self.pending and self.write(self.pending[0]):
+            self.pending.pop(0)
+
+    ## \brief Makes the VR world window visible, starting the process if needed.
+    def show(self):
+        self.send("show")
+        if self.pending:
+            self.start(hidden=False)  # Not running (or still starting): the command is sent once it is up
+        self.visible = True
+
+    ## \brief Hides the VR world window while keeping the process and assets loaded.
+    def hide(self):
+        self.send("hide")
+        self.visible = False
+
+    ## \brief Sends a new asymmetry score (0–100) to drive the VR lighting.
+    #  \param score Mapped asymmetry score.
+    def set_score(self, score):
+        if self.pending or not self.connect():
+            return  # Stale scores are not worth queueing
+        self.write({"command": "score", "value": float(score)})
+
+    ## \brief Stops the VR world; called when the GUI closes.
+    #
+    #  Asks a running world to exit over the socket. A process this client launched that
+    #  is not reachable yet (still starting) is terminated instead.
+    def shutdown(self):
+        self.pending = []
+        delivered = self.connect() and self.write({"command": "shutdown"})
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if not delivered and self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+        self.visible = False
@@ -3,6 +3,12 @@ from direct.showbase.ShowBase import ShowBase
 import simplepbr
 from panda3d.core import AmbientLight, DirectionalLight
 import math
+import os
+import sys
+import argparse
+import queue
+import threading
+from vr_control import socket_path, open_listener, decode_message
 
 ## \class VRWorld
 #  \brief Creates a 3D VR environment using Panda3D with a dynamic skybox and lighting system.
@@ -10,16 +16,29 @@ import math
 #  The VRWorld class sets up a Panda3D scene with a skybox model, ambient and directional lighting,
 #  and real-time lighting control based on an external score file (e.g., from EEG analysis).
 #  It continuously rotates the skybox for visual immersion and adjusts lighting dynamically.
+#
+#  The world is meant to run as a single long-lived process: it accepts show/hide/score/shutdown
+#  commands from the GUI over a local socket (see vr_control.py) instead of being relaunched.
+#  When it has a control socket, those score commands are the only lighting source; the score
+#  file is only polled when the world is run standalone.
 class VRWorld(ShowBase):
     ## \brief Constructor that initializes the 3D world, lighting, and skybox.
-    def __init__(self):
+    #  \param listener Optional listening socket for control connections from the GUI (see vr_control.open_listener()).
+    #  \param hidden Start with the window hidden until a 'show' command arrives.
+    #  \param parent_pid Optional pid of the launching GUI; the world exits when that process goes away.
+    def __init__(self, listener=None, hidden=False, parent_pid=None):
+        # Accept GUI connections right away so a client never waits on the Panda3D start-up
+        self.commands = queue.Queue()
+        self.listener = listener
+        if self.listener is not None:
+            threading.Thread(target=self.accept_clients, daemon=True).start()
+
         super().__init__()
         simplepbr.init()
 
-        # Load the skybox model
-        self.skybox = self.loader.loadModel("/home/jarred/git/Brainground/BCI/models/skybox.bam")
-        self.skybox.reparentTo(self.render)
-        self.skybox.set_scale(10000)
+        # Load the skybox model in the background so the first frame is not held up
+        self.skybox = None
+        self.loader.loadModel("/home/jarred/git/Brainground/BCI/models/skybox.bam", callback=self.attach_skybox)
 
         # Add Ambient Lighting
         self.alight = AmbientLight('alight')
@@ -37,13 +56,103 @@ class VRWorld(ShowBase):
         # Rotate the skybox slowly
         self.taskMgr.add(self.rotate_skybox, "RotateSkyboxTask")
 
-        # Listen for lighting score updates from file
-        self.taskMgr.add(self.listen_for_lighting, "LightingFileListener")
+        if self.listener is not None:
+            # Apply control commands (including scores) from the GUI
+            self.taskMgr.add(self.handle_commands, "ControlListener")
+        else:
+            # Standalone: listen for lighting score updates from file
+            self.taskMgr.add(self.listen_for_lighting, "LightingFileListener")
+
+        # Exit with the GUI that launched us, even if it crashed without sending 'shutdown'
+        self.parent_pid = parent_pid
+        if self.parent_pid is not None:
+            self.taskMgr.doMethodLater(1.0, self.watch_parent, "ParentWatchdog")
+
+        self.set_visible(not hidden)
+
+    ## \brief Attaches the skybox once the asynchronous model load has finished.
+    #  \param model Loaded skybox NodePath.
+    def attach_skybox(self, model):
+        self.skybox = model
+        self.skybox.reparentTo(self.render)
+        self.skybox.set_scale(10000)
+        print("✅ Skybox loaded")
+
+    ## \brief Shows or hides the VR window; rendering is paused while hidden.
+    #  \param visible True to show the window, False to hide it.
+    def set_visible(self, visible):
+        props = WindowProperties()
+        props.setMinimized(not visible)
+        if visible:
+            props.setForeground(True)
+        self.win.requestProperties(props)
+        self.win.setActive(visible)
+
+    ## \brief Sets the ambient and directional light brightness from a 0–100 score.
+    #  \param score Asymmetry score (0–100).
+    def set_brightness(self, score):
+        brightness = max(0.0, min(1.0, float(score) / 100.0))
+        self.alight.setColor((brightness, brightness, brightness, 1))
+        self.dlight.setColor((brightness, brightness, brightness, 1))
+
+    ## \brief Accepts GUI control connections (runs in a background thread).
+    def accept_clients(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return  # Listener closed on shutdown
+            threading.Thread(target=self.read_client, args=(conn,), daemon=True).start()
+
+    ## \brief Forwards commands from one GUI connection to the Panda3D task loop.
+    #
+    #  Each line is decoded as JSON and validated; anything else is dropped.
+    #
+    #  \param conn Accepted socket connection.
+    def read_client(self, conn):
+        try:
+            with conn, conn.makefile("r", encoding="utf-8") as lines:
+                for line in lines:
+                    message = decode_message(line)
+                    if message is None:
+                        print(f"⚠️ Ignoring invalid VR command: {line.strip()[:80]}")
+                        continue
+                    self.commands.put(message)
+        except (OSError, UnicodeDecodeError):
+            pass  # GUI closed; it can reconnect later
+
+    ## \brief Exits once the launching GUI process is gone.
+    #  \param task Panda3D task object.
+    #  \return task.again to re-check every second.
+    def watch_parent(self, task):
+        if os.getppid() != self.parent_pid:
+            print("⚠️ GUI process exited; shutting down VR World")
+            self.userExit()
+        return task.again
+
+    ## \brief Applies pending control commands on the Panda3D thread.
+    #  \param task Panda3D task object.
+    #  \return task.cont to keep the listener active.
+    def handle_commands(self, task):
+        while not self.commands.empty():
+            message = self.commands.get()
+            command = message["command"]
+            if command == "show":
+                self.set_visible(True)
+            elif command == "hide":
+                self.set_visible(False)
+            elif command == "score":
+                self.set_brightness(message["value"])
+            elif command == "shutdown":
+                self.userExit()
+        return task.cont
 
     ## \brief Continuously rotates the skybox to simulate motion.
     #  \param task Panda3D task object.
     #  \return task.cont to continue scheduling the task.
     def rotate_skybox(self, task):
+        if self.skybox is None:
+            return task.cont  # Still loading
         self.skybox.setH(self.skybox.getH() + 0.02)
         return task.cont
 
@@ -58,15 +167,42 @@ class VRWorld(ShowBase):
         try:
             # with open("/tmp/lighting_value.txt", "r") as f: # Slider Score
             with open("/home/jarred/git/Brainground/BCI/score_output.txt", "r") as f: # Actual Score
-                brightness = float(f.read().strip()) / 100.0
-                brightness = max(0.0, min(1.0, brightness))
-                self.alight.setColor((brightness, brightness, brightness, 1))
-                self.dlight.setColor((brightness, brightness, brightness, 1))
+                self.set_brightness(f.read().strip())
         except:
             pass  # File might not exist yet
         return task.cont
 
 ## \brief Entry point for running the VR simulation.
+#
+#  Binding the control socket first makes a second launch exit straight away instead of
+#  opening a duplicate window. Pass --hidden to pre-warm the world without showing it.
+#  Run with --no-control for the standalone mode that follows the score file.
 if __name__ == "__main__":
-    app = VRWorld()
-    app.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Brainground VR world.")
+    parser.add_argument("--socket", default=socket_path(), help="Control socket path")
+    parser.add_argument("--parent-pid", type=int, help="Exit when this process (the GUI) exits")
+    parser.add_argument("--hidden", action="store_true", help="Start minimized until shown")
+    parser.add_argument("--no-control", action="store_true", help="No control socket; follow the score file")
+    args = parser.parse_args()
+
+    listener = None
+    if not args.no_control:
+        try:
+            listener = open_listener(args.socket)
+        except PermissionError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        if listener is None:
+            print("⚠️ VR World is already running. Exiting.")
+            sys.exit(0)
+
+    if args.hidden:
+        loadPrcFileData("", "minimized #t")  # Open the pre-warmed window minimized
+    try:
+        app = VRWorld(listener, hidden=args.hidden, parent_pid=args.parent_pid)
+        app.run()
+    finally:
+        if listener is not None:
+            listener.close()
+            if os.path.exists(args.socket):
+                os.unlink(args.socket)